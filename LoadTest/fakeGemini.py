@@ -0,0 +1,93 @@
+import random
+import threading
+import time
+
+from AgentIA.documentAgent import DocumentAgent
+
+
+class FakeGeminiError(Exception):
+    """Raised by the fake chat to simulate a failed Gemini call."""
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeChat:
+    """
+    Stand-in for a Gemini chat session (`client.chats.create(...)`).
+    Each call sleeps for an injected latency and fails with `error_rate` probability.
+    Like the real chat, which resends its whole history on every call, the latency
+    grows by `history_latency` seconds per 1000 characters already exchanged.
+    Thread-safe, so a single chat can be shared by many concurrent sessions.
+    """
+
+    def __init__(self, latency=0.5, jitter=0.2, error_rate=0.0, history_latency=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.history_latency = history_latency
+        self.doc_types = list(DocumentAgent(None).missions)
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.history_chars = 0
+
+    def _draw(self):
+        """Draw latency, failure and label under the lock (Random is not thread-safe)."""
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self._random.gauss(self.latency, self.jitter))
+            delay += self.history_latency * self.history_chars / 1000
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+            doc_type = self._random.choice(self.doc_types)
+        return delay, failed, doc_type
+
+    def _record(self, prompt, text):
+        with self._lock:
+            self.history_chars += len(prompt) + len(text)
+
+    def send_message(self, prompt: str) -> FakeResponse:
+        delay, failed, doc_type = self._draw()
+        time.sleep(delay)
+
+        if failed:
+            raise FakeGeminiError("Simulated Gemini error (503 UNAVAILABLE).")
+
+        # Classification prompt expects a single label
+        if "Type du document" in prompt:
+            text = doc_type
+        else:
+            text = f"Réponse simulée ({len(prompt)} caractères analysés)."
+        self._record(prompt, text)
+        return FakeResponse(text)
+
+
+class FakeChats:
+    def __init__(self, client):
+        self.client = client
+        self.created = 0
+        self._lock = threading.Lock()
+
+    def create(self, model=None):
+        options = dict(self.client.chat_options)
+        with self._lock:
+            index = self.created
+            self.created += 1
+        # Offset the seed so per-session chats don't draw identical sequences
+        if options.get("seed") is not None:
+            options["seed"] += index
+        return FakeChat(**options)
+
+
+class FakeGeminiClient:
+    """Mimics `genai.Client` so code calling `client.chats.create(model=...)` runs offline."""
+
+    def __init__(self, api_key=None, **chat_options):
+        self.chat_options = chat_options
+        self.chats = FakeChats(self)
@@ -0,0 +1,414 @@
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import fitz  # PyMuPDF
+import langid
+import numpy as np
+
+try:
+    import resource  # Not available on Windows
+except ImportError:
+    resource = None
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import PDFanalysis.analysePDF as analysePDF
+from AgentIA.documentAgent import DocumentAgent
+from LoadTest.fakeGemini import FakeGeminiClient
+
+SAMPLE_TEXT = os.path.join(os.path.dirname(__file__), "..", "TextSamples", "sample.txt")
+SUPPORTED_TYPES = ["pdf", "png", "jpg", "jpeg"]
+
+
+class OCRError(Exception):
+    """Raised when ReadPDF produced no page or no text for a document."""
+
+
+def extension(name):
+    return name.split('.')[-1].lower()
+
+
+# -----------------------------------------------------------
+# Fake OCR engine (optional, skips the easyocr model)
+# -----------------------------------------------------------
+class FakeOCRReader:
+    """Mimics `easyocr.Reader.readtext` with a fixed latency per page."""
+
+    def __init__(self, text, latency=1.0):
+        self.text = text
+        self.latency = latency
+
+    def readtext(self, image, detail=0, paragraph=True):
+        time.sleep(self.latency)
+        return [self.text]
+
+
+# -----------------------------------------------------------
+# Synthetic documents
+# -----------------------------------------------------------
+def load_sample_text():
+    with open(SAMPLE_TEXT, encoding="utf-8") as f:
+        return f.read()
+
+
+def make_pdf(text, pages=1):
+    """Build an in-memory PDF with `text` written on every page."""
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        page.insert_text((50, 72), text, fontsize=10)
+    pdf_bytes = doc.tobytes()
+    doc.close()
+    return pdf_bytes
+
+
+def make_image(text, ext="png"):
+    """Render `text` line by line on a white A4-like canvas (150 dpi)."""
+    img = np.full((1754, 1240), 255, dtype=np.uint8)
+    for i, line in enumerate(text.splitlines()):
+        cv2.putText(img, line, (60, 80 + i * 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, 0, 2)
+    _, buffer = cv2.imencode(f".{ext}", img)
+    return buffer.tobytes()
+
+
+def parse_mix(mix):
+    """Parse a document mix such as 'pdf:2,png:1' into {extension: weight}."""
+    weights = {}
+    for item in mix.split(","):
+        ext, _, weight = item.strip().partition(":")
+        ext = ext.lower()
+        if ext not in SUPPORTED_TYPES:
+            raise ValueError(f"Unsupported document type in mix: {ext}")
+        weights[ext] = float(weight) if weight else 1.0
+    if not any(w > 0 for w in weights.values()):
+        raise ValueError(f"Document mix has no positive weight: {mix}")
+    return weights
+
+
+def build_corpus(mix, pages=1, docs_dir=None):
+    """
+    Return a list of (name, bytes) documents.
+    Uses the files of `docs_dir` if given, otherwise one synthetic document per type of the mix.
+    Types without a positive weight in the mix are left out.
+    """
+    if docs_dir:
+        corpus = []
+        for name in sorted(os.listdir(docs_dir)):
+            if mix.get(extension(name), 0.0) > 0:
+                with open(os.path.join(docs_dir, name), "rb") as f:
+                    corpus.append((name, f.read()))
+        if not corpus:
+            raise ValueError(f"No document matching the mix found in {docs_dir}")
+        return corpus
+
+    text = load_sample_text()
+    corpus = []
+    for ext, weight in mix.items():
+        if weight <= 0:
+            continue
+        if ext == "pdf":
+            corpus.append((f"sample_{pages}p.pdf", make_pdf(text, pages)))
+        else:
+            corpus.append((f"sample.{ext}", make_image(text, ext)))
+    return corpus
+
+
+class UploadedFile(io.BytesIO):
+    """Minimal stand-in for Streamlit's UploadedFile (bytes + name)."""
+
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+
+
+# -----------------------------------------------------------
+# Statistics
+# -----------------------------------------------------------
+def percentile(values, pct):
+    """Nearest-rank percentile, `pct` in [0, 100]."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(np.ceil(pct / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def latency_stats(values):
+    return {
+        "count": len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else 0.0,
+    }
+
+
+def peak_memory_mb():
+    """Peak resident set size of the process, in MB (None if unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+# -----------------------------------------------------------
+# Load test
+# -----------------------------------------------------------
+class LoadTest:
+    """
+    Runs N concurrent simulated sessions, each processing documents through
+    ReadPDF (shared cached OCR reader) and DocumentAgent.
+
+    Each session creates its own Gemini chat from the shared client, like
+    Web/mainStreamlit.py keeps it in `st.session_state`. `shared_chat` is a
+    what-if mode where every session talks to one chat.
+    `max_pages` caps the OCR pages per document, as the multi-document app intends to.
+    """
+
+    def __init__(self, client, corpus, weights, sessions=20, docs_per_session=3,
+                 shared_chat=False, max_pages=None, model="gemini-2.5-flash", seed=None):
+        for arg, value in [("sessions", sessions), ("docs_per_session", docs_per_session), ("max_pages", max_pages)]:
+            if value is not None and value < 1:
+                raise ValueError(f"{arg} must be a positive integer, got {value}")
+
+        self.corpus = [(name, data) for name, data in corpus if weights.get(extension(name), 0.0) > 0]
+        if not self.corpus:
+            raise ValueError("No document of the corpus has a positive weight in the mix.")
+
+        self.client = client
+        self.model = model
+        self.weights = weights
+        self.sessions = sessions
+        self.docs_per_session = docs_per_session
+        self.shared_chat = shared_chat
+        self.max_pages = max_pages
+        self.chat = client.chats.create(model=model) if shared_chat else None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.records = []
+        self.baseline_memory_mb = None
+
+    def _pick_documents(self):
+        """
+        Draw the documents of every session upfront so the mix is reproducible with a seed.
+        A type's weight is split between its files, so the mix holds whatever the folder contains.
+        """
+        counts = Counter(extension(name) for name, _ in self.corpus)
+        weights = [self.weights[extension(name)] / counts[extension(name)] for name, _ in self.corpus]
+        return [
+            self._random.choices(self.corpus, weights=weights, k=self.docs_per_session)
+            for _ in range(self.sessions)
+        ]
+
+    def _ocr(self, name, data, record):
+        reader = analysePDF.ReadPDF()
+        file = UploadedFile(name, data)
+        if extension(name) == "pdf":
+            reader.convert_pdf(file)
+        else:
+            reader.convert_img(file)
+
+        # ReadPDF.read_doc has no page limit, so trim the pages beforehand
+        if self.max_pages is not None:
+            reader.pages = reader.pages[:self.max_pages]
+
+        reader.detect_language()
+        reader.read_doc()
+        record["pages"] = len(reader.pages)
+
+        # ReadPDF swallows its exceptions (st.error), so detect failures from its state
+        if not reader.pages:
+            raise OCRError("No page could be decoded.")
+        if not reader.text.strip():
+            raise OCRError("OCR returned no text.")
+        return reader.text
+
+    def process(self, name, data, chat):
+        record = {"name": name, "pages": 0, "error": None, "error_stage": None, "agent": None}
+        start = time.perf_counter()
+        stage = "ocr"
+        try:
+            text = self._ocr(name, data, record)
+            record["ocr"] = time.perf_counter() - start
+
+            stage = "gemini"
+            agent_start = time.perf_counter()
+            try:
+                DocumentAgent(chat).run(text)
+            finally:
+                record["agent"] = time.perf_counter() - agent_start
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            record["error_stage"] = stage
+        record.setdefault("ocr", time.perf_counter() - start)
+        record["total"] = time.perf_counter() - start
+        return record
+
+    def run_session(self, documents):
+        chat = self.chat or self.client.chats.create(model=self.model)
+        for name, data in documents:
+            record = self.process(name, data, chat)
+            with self._lock:
+                self.records.append(record)
+
+    def run(self):
+        plan = self._pick_documents()
+        self.records = []
+        self.baseline_memory_mb = peak_memory_mb()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.sessions) as pool:
+            list(pool.map(self.run_session, plan))
+        duration = time.perf_counter() - start
+
+        return self.report(duration)
+
+    def report(self, duration):
+        """
+        Latency percentiles include failed documents; `total_failed` isolates them.
+        Memory is the process peak RSS before and after the load: `added_mb` is what
+        the sessions pushed above the peak reached by model loading and corpus building.
+        """
+        baseline = self.baseline_memory_mb
+        peak = peak_memory_mb()
+        ok = [r for r in self.records if r["error"] is None]
+        errors = [r for r in self.records if r["error"] is not None]
+        return {
+            "sessions": self.sessions,
+            "shared_chat": self.shared_chat,
+            "documents": len(self.records),
+            "errors": len(errors),
+            "ocr_errors": sum(r["error_stage"] == "ocr" for r in errors),
+            "gemini_errors": sum(r["error_stage"] == "gemini" for r in errors),
+            "error_rate": len(errors) / len(self.records) if self.records else 0.0,
+            "duration_s": duration,
+            "throughput_docs_per_s": len(ok) / duration if duration else 0.0,
+            "pages_per_s": sum(r["pages"] for r in ok) / duration if duration else 0.0,
+            "latency_s": {
+                "total": latency_stats([r["total"] for r in self.records]),
+                "ocr": latency_stats([r["ocr"] for r in self.records]),
+                "agent": latency_stats([r["agent"] for r in self.records if r["agent"] is not None]),
+                "total_failed": latency_stats([r["total"] for r in errors]),
+            },
+            "memory": {
+                "baseline_peak_mb": baseline,
+                "peak_mb": peak,
+                "added_mb": peak - baseline if None not in (peak, baseline) else None,
+            },
+            "error_samples": sorted({f"[{r['error_stage']}] {r['error']}" for r in errors})[:5],
+        }
+
+
+def print_report(report):
+    chat_mode = "shared chat" if report["shared_chat"] else "one chat per session"
+    print(f"\n=== Load test: {report['sessions']} sessions ({chat_mode}), {report['documents']} documents ===")
+    print(f"Duration     : {report['duration_s']:.2f}s")
+    print(f"Throughput   : {report['throughput_docs_per_s']:.2f} docs/s ({report['pages_per_s']:.2f} pages/s)")
+    print(
+        f"Errors       : {report['errors']} ({report['error_rate']:.1%}) - "
+        f"OCR: {report['ocr_errors']}, Gemini: {report['gemini_errors']}"
+    )
+    for stage, stats in report["latency_s"].items():
+        print(
+            f"Latency {stage:<12}: n={stats['count']} p50={stats['p50']:.2f}s p95={stats['p95']:.2f}s "
+            f"p99={stats['p99']:.2f}s max={stats['max']:.2f}s"
+        )
+    memory = report["memory"]
+    if memory["added_mb"] is not None:
+        print(
+            f"Peak memory  : {memory['peak_mb']:.0f} MB "
+            f"(before load: {memory['baseline_peak_mb']:.0f} MB, added: {memory['added_mb']:.0f} MB)"
+        )
+    for error in report["error_samples"]:
+        print(f"  - {error}")
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent load test of the OCR + agent pipeline against a fake Gemini.")
+    parser.add_argument("--sessions", type=positive_int, default=20, help="Number of concurrent simulated sessions")
+    parser.add_argument("--docs-per-session", type=positive_int, default=3, help="Documents uploaded by each session")
+    parser.add_argument("--mix", default="pdf:2,png:1", help="Synthetic document mix, e.g. 'pdf:2,png:1,jpg:1'")
+    parser.add_argument("--pages", type=positive_int, default=1, help="Pages per synthetic PDF")
+    parser.add_argument("--max-pages", type=positive_int, help="Max pages OCR'd per document (as in the multi-document app)")
+    parser.add_argument("--docs-dir", help="Use the documents of this folder instead of synthetic ones")
+    parser.add_argument("--gemini-latency", type=float, default=1.0, help="Mean fake Gemini latency (s)")
+    parser.add_argument("--gemini-jitter", type=float, default=0.3, help="Std deviation of the fake Gemini latency (s)")
+    parser.add_argument("--gemini-error-rate", type=float, default=0.0, help="Probability that a Gemini call fails")
+    parser.add_argument(
+        "--gemini-history-latency", type=float, default=0.0,
+        help="Extra fake Gemini latency (s) per 1000 characters of chat history",
+    )
+    parser.add_argument(
+        "--chat", choices=["session", "shared"], default="session",
+        help="One Gemini chat per session (as in the apps), or one chat shared by all sessions (what-if)",
+    )
+    parser.add_argument("--fake-ocr", action="store_true", help="Replace easyocr with a fake reader")
+    parser.add_argument("--ocr-latency", type=float, default=1.0, help="Per-page latency of the fake OCR reader (s)")
+    parser.add_argument("--seed", type=int, help="Random seed for a reproducible run")
+    parser.add_argument("--json", help="Write the report to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.fake_ocr:
+        fake_reader = FakeOCRReader(load_sample_text(), latency=args.ocr_latency)
+        analysePDF.load_ocr_reader = lambda: fake_reader
+    else:
+        # Load the shared model before timing, as the deployed app does on first use
+        analysePDF.load_ocr_reader()
+    # langid loads its model lazily on first use: do it once rather than in every session
+    langid.classify("warm up")
+
+    client = FakeGeminiClient(
+        latency=args.gemini_latency,
+        jitter=args.gemini_jitter,
+        error_rate=args.gemini_error_rate,
+        history_latency=args.gemini_history_latency,
+        seed=args.seed,
+    )
+
+    weights = parse_mix(args.mix)
+    corpus = build_corpus(weights, pages=args.pages, docs_dir=args.docs_dir)
+
+    load_test = LoadTest(
+        client,
+        corpus,
+        weights,
+        sessions=args.sessions,
+        docs_per_session=args.docs_per_session,
+        shared_chat=args.chat == "shared",
+        max_pages=args.max_pages,
+        seed=args.seed,
+    )
+    report = load_test.run()
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
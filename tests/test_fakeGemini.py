@@ -0,0 +1,44 @@
+import time
+
+import pytest
+
+from AgentIA.documentAgent import DocumentAgent
+from LoadTest.fakeGemini import FakeGeminiClient, FakeGeminiError
+
+
+@pytest.fixture
+def chat():
+    client = FakeGeminiClient(latency=0, jitter=0, seed=0)
+    return client.chats.create(model="gemini-2.5-flash")
+
+
+def test_classify_returns_known_label(chat):
+    agent = DocumentAgent(chat)
+    assert agent.classify("Facture n°1") in agent.missions
+
+
+def test_run_with_fake_chat(chat):
+    output = DocumentAgent(chat).run("Texte de test")
+
+    assert output["result"].startswith("Réponse simulée")
+    assert chat.calls == 2
+    assert chat.errors == 0
+
+
+def test_error_rate():
+    chat = FakeGeminiClient(latency=0, jitter=0, error_rate=1.0).chats.create()
+
+    with pytest.raises(FakeGeminiError):
+        chat.send_message("prompt")
+    assert chat.errors == 1
+
+
+def test_history_latency_grows():
+    chat = FakeGeminiClient(latency=0, jitter=0, history_latency=0.2).chats.create()
+
+    response = chat.send_message("x" * 500)
+    assert chat.history_chars == 500 + len(response.text)
+
+    start = time.perf_counter()
+    chat.send_message("y")
+    assert time.perf_counter() - start >= 0.2 * chat.history_chars / 1000 * 0.9
@@ -0,0 +1,87 @@
+import pytest
+
+from LoadTest.fakeGemini import FakeGeminiClient
+from LoadTest.loadTest import FakeOCRReader, LoadTest, build_corpus, parse_args, parse_mix, percentile
+import PDFanalysis.analysePDF as analysePDF
+
+
+@pytest.fixture(autouse=True)
+def fake_ocr(monkeypatch):
+    """Replace the cached easyocr model with an instant fake reader"""
+    fake_reader = FakeOCRReader("Facture ACME", latency=0)
+    monkeypatch.setattr(analysePDF, "load_ocr_reader", lambda: fake_reader)
+
+
+def test_parse_mix():
+    assert parse_mix("pdf:2,PNG") == {"pdf": 2.0, "png": 1.0}
+    with pytest.raises(ValueError):
+        parse_mix("docx:1")
+    with pytest.raises(ValueError):
+        parse_mix("pdf:0")
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 95) == 0.0
+
+
+def test_load_test_report():
+    weights = parse_mix("pdf:1,png:1")
+    corpus = build_corpus(weights, pages=2)
+    client = FakeGeminiClient(latency=0, jitter=0, error_rate=0, seed=1)
+
+    report = LoadTest(client, corpus, weights, sessions=4, docs_per_session=3, max_pages=1, seed=1).run()
+
+    assert report["documents"] == 12
+    assert report["errors"] == 0
+    assert report["latency_s"]["ocr"]["count"] == 12
+    assert report["throughput_docs_per_s"] > 0
+
+
+def test_mix_excludes_other_types():
+    corpus = build_corpus(parse_mix("pdf:1,png:1"))
+    load_test = LoadTest(FakeGeminiClient(latency=0, jitter=0), corpus, parse_mix("pdf:1"), sessions=2)
+
+    assert all(name.endswith(".pdf") for plan in load_test._pick_documents() for name, _ in plan)
+
+
+def test_mix_is_per_type_not_per_file():
+    corpus = [(f"doc{i}.pdf", b"") for i in range(10)] + [("scan.png", b"")]
+    load_test = LoadTest(FakeGeminiClient(), corpus, parse_mix("pdf:1,png:1"), sessions=1, docs_per_session=2000, seed=0)
+
+    names = [name for name, _ in load_test._pick_documents()[0]]
+    assert 0.4 < names.count("scan.png") / len(names) < 0.6
+
+
+def test_invalid_sizes():
+    corpus = [("doc.pdf", b"")]
+    for kwargs in [{"sessions": 0}, {"docs_per_session": -1}, {"max_pages": 0}]:
+        with pytest.raises(ValueError):
+            LoadTest(FakeGeminiClient(), corpus, parse_mix("pdf"), **kwargs)
+    with pytest.raises(SystemExit):
+        parse_args(["--sessions", "0"])
+
+
+def test_ocr_errors_are_reported():
+    corpus = [("broken.png", b"not an image")]
+    client = FakeGeminiClient(latency=0, jitter=0)
+
+    report = LoadTest(client, corpus, parse_mix("png"), sessions=2, docs_per_session=2).run()
+
+    assert report["ocr_errors"] == 4
+    assert report["gemini_errors"] == 0
+    assert report["latency_s"]["total_failed"]["count"] == 4
+
+
+def test_gemini_errors_are_reported():
+    corpus = build_corpus(parse_mix("pdf"))
+    client = FakeGeminiClient(latency=0, jitter=0, error_rate=1.0)
+
+    report = LoadTest(client, corpus, parse_mix("pdf"), sessions=2, docs_per_session=2).run()
+
+    assert report["gemini_errors"] == 4
+    assert report["ocr_errors"] == 0
+    assert report["latency_s"]["total"]["count"] == 4
+    assert report["memory"]["peak_mb"] >= report["memory"]["baseline_peak_mb"]